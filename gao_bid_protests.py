@@ -1,14 +1,24 @@
 import argparse
+import asyncio
+import csv
+import functools
 import json
 import os
 import random
 import re
+import threading
 import time
-from typing import Dict, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO, Tuple
 
-import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, Side
+from openpyxl.utils import get_column_letter
 from requests.adapters import HTTPAdapter, Retry
 
 try:
@@ -16,53 +26,98 @@ try:
 except Exception:
     cloudscraper = None
 
+try:
+    import xxhash
+except Exception:
+    xxhash = None
+
+try:
+    import aiohttp
+except Exception:
+    aiohttp = None
+
 SEARCH_URL_DEFAULT = (
     "https://www.gao.gov/search?keyword=Bid%20Protest%20Decisions"
     "&facets_query=&f%5B0%5D=ctype_search%3ABid%20Protest"
     "&f%5B1%5D=ctype_search%3ABid%20Protest%20Decision"
 )
+WRITE_EVERY = 25
+
+_SANITIZE_RX = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F]")
+_HYPHEN_NL_RX = re.compile(r"(\w)-\n(\w)")
+_MULTI_NL_RX = re.compile(r"\n{3,}")
+_BOILERPLATE_LINES = [
+    r"441 G St\. N\.W\.",
+    r"Washington, DC\b[^\n]*",
+    r"Comptroller General\b[^\n]*",
+    r"of the United States",
+    r"U\.?S\.? Government Accountability Office",
+    r"www\.gao\.gov",
+    r"Page[^\S\n]+\d+",
+    r"[^\S\n]*B-\d{4,7}(?:\.\d+)?",
+    r"[^\S\n]*(?:~+|–+|-{2,})",
+]
+_BOILER_FIRST = r"[4WCOUPB~–\-\s]"
+_BOILER = (
+    r"(?=" + _BOILER_FIRST + r")(?:" + "|".join(_BOILERPLATE_LINES) + r")[^\S\n]*(?:\n|\Z)"
+)
+_FUSED_RX = re.compile(
+    r"(?=[\x00-\x1F\s\-])(?:"
+    r"(?P<ctrl>[\x00-\x08\x0B\x0C\x0E-\x1F\r])"
+    r"|-(?<=\w-)[^\S\n]*\n(?=(?P<bl>(?:" + _BOILER + r")*))(?P=bl)(?P<hy>\w)"
+    r"|[^\S\n]+(?=\n|\Z)"
+    r"|(?P<gap>\n(?:[^\S\n]*(?:\n|\Z)|" + _BOILER + r")+)"
+    r")",
+    re.IGNORECASE | re.MULTILINE,
+)
+_BNUM_RX = re.compile(r"B-\d{4,7}(?:\.\d+)?")
+_DATE_RX = re.compile(
+    r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)\s+\d{1,2},\s+\d{4}"
+)
+_SHEET_BAD = str.maketrans({c: "_" for c in r"\/*?:[]"})
 
 def human_sleep(a: float = 0.35, b: float = 0.9) -> None:
     time.sleep(a + (b - a) * random.random())
 
+_CTRL_TABLE = dict.fromkeys([*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20)])
+
+@functools.lru_cache(maxsize=64)
+def _sanitize(s: str) -> str:
+    if s.isascii():
+        return s.translate(_CTRL_TABLE)
+    return _SANITIZE_RX.sub("", s)
+
 def sanitize_for_excel(s: Optional[str]) -> str:
     if s is None:
         return ""
-    return re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F]", "", s)
+    return _sanitize(s)
 
 def sanitize_for_json(s: Optional[str]) -> str:
     if s is None:
         return ""
-    return re.sub(r"[\x00-\x08\x0B\x0C\x0E-\x1F]", "", s)
+    return _sanitize(s)
 
 def normalize_text(txt: str) -> str:
     if not txt:
         return ""
     txt = txt.replace("\r", "")
-    txt = re.sub(r"(\w)-\n(\w)", r"\1\2", txt)
-    txt = re.sub(r"\n{3,}", "\n\n", txt)
+    txt = _HYPHEN_NL_RX.sub(r"\1\2", txt)
+    txt = _MULTI_NL_RX.sub("\n\n", txt)
     return txt.strip()
 
+def _fused_repl(m: re.Match) -> str:
+    kind = m.lastgroup
+    if kind == "hy":
+        return m.group("hy")
+    if kind == "gap":
+        blank = any(not l.strip() for l in m.group().split("\n")[1:-1])
+        return "\n\n" if blank else "\n"
+    return ""
+
 def clean_report_text(txt: str) -> str:
     if not txt:
         return ""
-    lines = [l.rstrip() for l in txt.split("\n")]
-    drop_patterns = [
-        r"^441 G St\. N\.W\.$",
-        r"^Washington, DC\b.*$",
-        r"^Comptroller General\b.*$",
-        r"^of the United States$",
-        r"^U\.?S\.? Government Accountability Office$",
-        r"^www\.gao\.gov$",
-        r"^Page\s+\d+\s*$",
-        r"^B-\d{4,7}(\.\d+)?\s*$",
-        r"^\s*~+\s*$|^\s*–+\s*$|^\s*-{2,}\s*$",
-    ]
-    drop_rx = re.compile("|".join(drop_patterns), re.IGNORECASE)
-    kept = [l for l in lines if not drop_rx.search(l)]
-    txt2 = "\n".join(kept)
-    txt2 = re.sub(r"\n\s*B-\d{4,7}(\.\d+)?\s*\n", "\n", txt2)
-    return normalize_text(txt2)
+    return _FUSED_RX.sub(_fused_repl, "\n" + txt).strip()
 
 KNOWN_ORDER = [
     "DIGEST",
@@ -74,26 +129,24 @@ KNOWN_ORDER = [
     "CONCLUSIONS",
     "RECOMMENDATIONS",
 ]
-CAPS_LINE = r"(?m)^(?P<cap>[A-Z0-9][A-Z0-9\s’'()/\-,.:;]{3,40})$"
+_CAPS_HEADING = r"[A-Z0-9][A-Z0-9\s’'()/\-,.:;]{3,40}"
+_HEAD_RX = re.compile(
+    r"(?m)^(?:(?P<known>" + "|".join(re.escape(h) for h in KNOWN_ORDER) + r")"
+    r"|(?P<caps>" + _CAPS_HEADING + r"))\s*$"
+)
+_IGNORED_HEADINGS = ("U N I T E D  S T A T E S",)
 
 def split_sections(full_text: str) -> Dict[str, str]:
     ft = normalize_text(full_text)
     if not ft:
         return {}
-    found_positions: Dict[str, int] = {}
-    for h in KNOWN_ORDER:
-        m = re.search(fr"(?m)^{re.escape(h)}\s*$", ft)
-        if m:
-            found_positions[h] = m.start()
-    for m in re.finditer(CAPS_LINE, ft):
-        cap = m.group("cap").strip()
-        if cap.upper() == cap and cap not in ("U N I T E D  S T A T E S",):
-            found_positions.setdefault(cap, m.start())
-    if not found_positions:
+    marks = []
+    for m in _HEAD_RX.finditer(ft):
+        name = (m.group("known") or m.group("caps")).strip()
+        if name not in _IGNORED_HEADINGS:
+            marks.append((name, m.start(), m.end()))
+    if not marks:
         return {"Full Report Text": ft}
-    ordered = [h for h, _ in sorted(found_positions.items(), key=lambda kv: kv[1])]
-    rx = re.compile("(?m)^(" + "|".join(re.escape(h) for h in ordered) + r")\s*$")
-    marks = [(m.group(0).strip(), m.start(), m.end()) for m in rx.finditer(ft)]
     out: Dict[str, str] = {}
     for i, (name, st, en) in enumerate(marks):
         body = ft[en:(marks[i + 1][1] if i + 1 < len(marks) else len(ft))].strip()
@@ -110,13 +163,18 @@ _UAS = [
 def _rand_ua() -> str:
     return random.choice(_UAS)
 
-def build_session() -> requests.Session:
-    if cloudscraper is not None:
-        s = cloudscraper.create_scraper(
-            browser={"browser": "chrome", "platform": "windows", "mobile": False}
-        )
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
+REBUILD_COOLDOWN = 30.0
+_rebuild_lock = threading.Lock()
+_last_rebuild = 0.0
+_warmed = False
+
+def _apply_session_defaults(s: requests.Session) -> None:
+    if cloudscraper is not None and isinstance(s, cloudscraper.CloudScraper):
+        for adapter in s.adapters.values():
+            adapter.init_poolmanager(POOL_CONNECTIONS, POOL_MAXSIZE, block=False)
     else:
-        s = requests.Session()
         retries = Retry(
             total=5,
             backoff_factor=0.7,
@@ -124,55 +182,128 @@ def build_session() -> requests.Session:
             allowed_methods=frozenset(["GET"]),
             raise_on_status=False,
         )
-        s.mount("https://", HTTPAdapter(max_retries=retries))
-        s.mount("http://", HTTPAdapter(max_retries=retries))
-    ua = _rand_ua()
+        adapter = HTTPAdapter(
+            max_retries=retries,
+            pool_connections=POOL_CONNECTIONS,
+            pool_maxsize=POOL_MAXSIZE,
+            pool_block=False,
+        )
+        s.mount("https://", adapter)
+        s.mount("http://", adapter)
     s.headers.update({
-        "User-Agent": ua,
+        "User-Agent": _rand_ua(),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.9",
         "Accept-Encoding": "gzip, deflate, br",
         "Connection": "keep-alive",
+        "Keep-Alive": "timeout=60, max=1000",
         "Upgrade-Insecure-Requests": "1",
         "Sec-Fetch-Dest": "document",
         "Sec-Fetch-Mode": "navigate",
         "Sec-Fetch-Site": "same-origin",
         "Sec-Fetch-User": "?1",
     })
-    for warm in ["https://www.gao.gov/", "https://www.gao.gov/search"]:
+
+def build_session() -> requests.Session:
+    global _warmed
+    if cloudscraper is not None:
+        s = cloudscraper.create_scraper(
+            browser={"browser": "chrome", "platform": "windows", "mobile": False}
+        )
+    else:
+        s = requests.Session()
+    _apply_session_defaults(s)
+    if not _warmed:
         try:
-            s.get(warm, timeout=30)
+            s.head("https://www.gao.gov/", timeout=15, allow_redirects=True)
+            if cloudscraper is not None and "cf_clearance" not in s.cookies:
+                s.get("https://www.gao.gov/", timeout=30)
             time.sleep(0.6)
         except Exception:
             pass
+        _warmed = True
     return s
 
-def get_html(session: requests.Session, url: str) -> Optional[BeautifulSoup]:
+_tls = threading.local()
+
+def _get_parser() -> lxml_html.HTMLParser:
+    p = getattr(_tls, "parser", None)
+    if p is None:
+        p = lxml_html.HTMLParser(encoding="utf-8", recover=True)
+        _tls.parser = p
+    return p
+
+def _parse_chunks(chunks: Iterable[bytes], url: str) -> Optional[lxml_html.HtmlElement]:
+    parser = _get_parser()
+    try:
+        parser.feed(b"")
+        for chunk in chunks:
+            parser.feed(chunk)
+    except BaseException:
+        try:
+            parser.close()
+        except etree.XMLSyntaxError:
+            pass
+        raise
+    tree = parser.close()
+    if tree is None:
+        print(f"[WARN] empty document {url}")
+    return tree
+
+def _parse_stream(r: requests.Response, url: str) -> Optional[lxml_html.HtmlElement]:
+    try:
+        return _parse_chunks(r.iter_content(65536), url)
+    finally:
+        r.close()
+
+def _referer_headers(u: str) -> Dict[str, str]:
+    if "/search" in u:
+        return {"Referer": "https://www.gao.gov/"}
+    if "/products/" in u:
+        return {"Referer": "https://www.gao.gov/search"}
+    return {}
+
+def get_html(session: requests.Session, url: str) -> Optional[lxml_html.HtmlElement]:
+    global _last_rebuild
     def _fetch(u: str) -> requests.Response:
-        hdrs = {}
-        if "/search" in u:
-            hdrs["Referer"] = "https://www.gao.gov/"
-        elif "/products/" in u:
-            hdrs["Referer"] = "https://www.gao.gov/search"
-        return session.get(u, headers=hdrs, timeout=60)
+        return session.get(u, headers=_referer_headers(u), timeout=60, stream=True)
     try:
         r = _fetch(url)
         if r.status_code == 200:
-            return BeautifulSoup(r.text, "lxml")
+            return _parse_stream(r, url)
+        r.close()
         if r.status_code == 403:
             session.headers["User-Agent"] = _rand_ua()
             time.sleep(1.0)
             r2 = _fetch(url)
             if r2.status_code == 200:
-                return BeautifulSoup(r2.text, "lxml")
-            new_session = build_session()
-            time.sleep(1.0)
-            r3 = new_session.get(url, timeout=60)
-            if r3.status_code == 200:
-                session.cookies = new_session.cookies
-                session.headers.update(new_session.headers)
-                return BeautifulSoup(r3.text, "lxml")
-            print(f"[WARN] GET {url} -> {r3.status_code} after rebuild")
+                return _parse_stream(r2, url)
+            r2.close()
+            new_session = None
+            try:
+                with _rebuild_lock:
+                    rebuilt = time.time() - _last_rebuild >= REBUILD_COOLDOWN
+                    if rebuilt:
+                        _last_rebuild = time.time()
+                        new_session = build_session()
+                        time.sleep(1.0)
+                        r3 = new_session.get(url, timeout=60, stream=True)
+                        if r3.status_code == 200:
+                            session.cookies = new_session.cookies
+                            session.headers.update(new_session.headers)
+                if not rebuilt:
+                    time.sleep(2.0)
+                    r3 = _fetch(url)
+                if r3.status_code == 200:
+                    return _parse_stream(r3, url)
+                r3.close()
+            finally:
+                if new_session is not None:
+                    new_session.close()
+            if rebuilt:
+                print(f"[WARN] GET {url} -> {r3.status_code} after rebuild")
+            else:
+                print(f"[WARN] GET {url} -> {r3.status_code} (session rebuild on cooldown)")
             return None
         print(f"[WARN] GET {url} -> {r.status_code}")
         return None
@@ -180,23 +311,57 @@ def get_html(session: requests.Session, url: str) -> Optional[BeautifulSoup]:
         print(f"[WARN] request failed {url}: {e}")
         return None
 
-def collect_result_links_from_page(soup: BeautifulSoup) -> List[str]:
+def _first(el: lxml_html.HtmlElement, xpath: str) -> Optional[lxml_html.HtmlElement]:
+    found = el.xpath(xpath)
+    return found[0] if found else None
+
+_TEXT_XPATH = etree.XPath(
+    ".//text()[not(ancestor::script or ancestor::style)]", smart_strings=False
+)
+
+def _get_text(el: lxml_html.HtmlElement, sep: str = "") -> str:
+    return sep.join(t.strip() for t in _TEXT_XPATH(el) if t.strip())
+
+_MAIN_XPATH = etree.XPath("//main")
+_LINK_XPATH = etree.XPath(".//a[contains(@href, '/products/')]")
+
+def _main_or_root(tree: lxml_html.HtmlElement) -> lxml_html.HtmlElement:
+    found = _MAIN_XPATH(tree)
+    return found[0] if found else tree
+
+def _url_key(url: str) -> int:
+    if xxhash is not None:
+        return xxhash.xxh3_64_intdigest(url.encode())
+    return hash(url)
+
+def collect_result_links_from_page(
+    tree: lxml_html.HtmlElement, seen: Optional[Set[int]] = None
+) -> List[str]:
     links: List[str] = []
-    seen: Set[str] = set()
-    main = soup.select_one("main") or soup
-    for a in main.select("a[href*='/products/']"):
+    if seen is None:
+        seen = set()
+    for a in _LINK_XPATH(_main_or_root(tree)):
         href = a.get("href", "")
-        title = (a.get_text(strip=True) or "")
-        if href and "/products/" in href and title and href not in seen:
-            if href.startswith("/"):
-                href = "https://www.gao.gov" + href
+        if not href:
+            continue
+        title = (a.text or "").strip()
+        if not title and len(a):
+            title = _get_text(a)
+        if not title:
+            continue
+        if href.startswith("/"):
+            href = "https://www.gao.gov" + href
+        key = _url_key(href)
+        if key not in seen:
             links.append(href)
-            seen.add(href)
+            seen.add(key)
     return links
 
-def get_next_page(soup: BeautifulSoup) -> Optional[str]:
-    a = soup.select_one("a[rel='next']") or soup.find("a", string=lambda t: t and "Next" in t)
-    if not a:
+def get_next_page(tree: lxml_html.HtmlElement) -> Optional[str]:
+    a = _first(tree, "//a[@rel='next']")
+    if a is None:
+        a = _first(tree, "//a[text()[contains(., 'Next')]]")
+    if a is None:
         return None
     href = a.get("href", "")
     if not href:
@@ -205,203 +370,378 @@ def get_next_page(soup: BeautifulSoup) -> Optional[str]:
         href = "https://www.gao.gov" + href
     return href
 
-def get_title_file_date_from_doc(soup: BeautifulSoup) -> Tuple[str, str, str]:
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_FIELD_ITEM = f"div[{_has_class('field__item')}]"
+_META_XPATH = etree.XPath(
+    f".//*[{_has_class('field--name-field-file-number')} or {_has_class('node__meta')}]"
+    " | .//time | .//h1/following-sibling::p[position() <= 2]"
+)
+
+def _iso_to_gao_date(value: str) -> str:
+    try:
+        d = datetime.fromisoformat(value.strip()[:10])
+    except ValueError:
+        return ""
+    return f"{d:%b} {d.day}, {d.year}"
+
+def get_title_file_date_from_doc(tree: lxml_html.HtmlElement) -> Tuple[str, str, str]:
     title = ""
     file_no = ""
     date = ""
-    h1 = soup.find("h1")
-    if h1:
-        title = h1.get_text(strip=True)
-    main_text = (soup.select_one("main") or soup).get_text(" ", strip=True)
-    m = re.search(r"B-\d{4,7}(?:\.\d+)?", main_text)
-    if m:
-        file_no = m.group(0)
-    m = re.search(
-        r"(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)\s+\d{1,2},\s+\d{4}",
-        main_text,
-    )
-    if m:
-        date = m.group(0)
+    h1 = _first(tree, "//h1")
+    if h1 is not None:
+        title = _get_text(h1)
+    main = _main_or_root(tree)
+    for el in _META_XPATH(main)[:3]:
+        text = _get_text(el, " ")
+        if not file_no:
+            m = _BNUM_RX.search(text)
+            if m:
+                file_no = m.group(0)
+        if not date:
+            m = _DATE_RX.search(text)
+            if m:
+                date = m.group(0)
+            elif el.tag == "time" and el.get("datetime"):
+                date = _iso_to_gao_date(el.get("datetime"))
+    if not (file_no and date):
+        main_text = _get_text(main, " ")
+        if not file_no:
+            m = _BNUM_RX.search(main_text)
+            if m:
+                file_no = m.group(0)
+        if not date:
+            m = _DATE_RX.search(main_text)
+            if m:
+                date = m.group(0)
     return title, file_no, date
 
-def extract_expanded_decision_text(soup: BeautifulSoup) -> str:
-    container = soup.select_one("div.field__item[data-readmore]") or soup.select_one("div[data-readmore]")
-    if container:
-        for br in container.find_all(["br"]):
-            br.replace_with("\n")
-        return container.get_text("\n", strip=True)
-    for block in soup.select("div.field__item"):
-        if block.find("p") and "Decision" in block.get_text(" ", strip=True)[:50]:
-            for br in block.find_all(["br"]):
-                br.replace_with("\n")
-            return block.get_text("\n", strip=True)
-    return (soup.select_one("main") or soup).get_text("\n", strip=True)
+def extract_expanded_decision_text(tree: lxml_html.HtmlElement) -> str:
+    container = _first(tree, f"//{_FIELD_ITEM}[@data-readmore]")
+    if container is None:
+        container = _first(tree, "//div[@data-readmore]")
+    if container is not None:
+        return _get_text(container, "\n")
+    for block in tree.xpath(f"//{_FIELD_ITEM}"):
+        if block.find(".//p") is not None and "Decision" in _get_text(block, " ")[:50]:
+            return _get_text(block, "\n")
+    return _get_text(_main_or_root(tree), "\n")
 
-def scrape_item_with_bs(session: requests.Session, url: str) -> dict:
-    soup = get_html(session, url)
-    if soup is None:
-        return {
-            "base": {"url": url, "title": "", "file_number": "", "date": ""},
-            "pdf_pages": None,
-            "full_text": "",
-            "sections": {},
-        }
-    title, file_no, date = get_title_file_date_from_doc(soup)
-    raw = extract_expanded_decision_text(soup)
+def _empty_record(url: str) -> dict:
+    return {
+        "base": {"url": url, "title": "", "file_number": "", "date": ""},
+        "pdf_pages": None,
+        "full_text": "",
+        "sections": {},
+    }
+
+def _record_from_tree(url: str, tree: lxml_html.HtmlElement) -> dict:
+    title, file_no, date = get_title_file_date_from_doc(tree)
+    raw = extract_expanded_decision_text(tree)
     cleaned = clean_report_text(raw)
     sections = split_sections(cleaned)
     return {
         "base": {"url": url, "title": title, "file_number": file_no, "date": date},
         "pdf_pages": None,
-        "full_text": normalize_text(cleaned),
+        "full_text": cleaned,
         "sections": sections,
     }
 
-def write_outputs(records: List[dict], out_csv: str, out_xlsx: str) -> None:
-    upload_rows = []
-    for r in records:
-        base = r["base"]
-        sections_clean = {
-            k: sanitize_for_json(v)
-            for k, v in r["sections"].items()
-            if v and v.strip() and k != "Full Report Text"
-        }
-        meta = {
-            "file_number": base.get("file_number") or "",
-            "title": base.get("title") or "",
-            "date": base.get("date") or "",
-            "pdf_pages": r.get("pdf_pages"),
-            "url": base.get("url") or "",
-            "sections": sections_clean,
-        }
-        meta_json = json.dumps(meta, ensure_ascii=False, separators=(",", ":"))
-        full_txt = sanitize_for_json(r.get("full_text", ""))
-        upload_rows.append(
-            {"protest_id": "", "file_metadata": meta_json, "file_content": full_txt}
+def scrape_item_with_bs(session: requests.Session, url: str) -> dict:
+    tree = get_html(session, url)
+    if tree is None:
+        return _empty_record(url)
+    return _record_from_tree(url, tree)
+
+def parse_and_extract(url: str, body: bytes) -> dict:
+    try:
+        tree = _parse_chunks([body], url)
+    except etree.XMLSyntaxError as e:
+        print(f"[WARN] parse failed {url}: {e}")
+        return _empty_record(url)
+    if tree is None:
+        return _empty_record(url)
+    return _record_from_tree(url, tree)
+
+_AIOHTTP_SKIP_HEADERS = {"accept-encoding", "connection", "keep-alive"}
+
+def _aiohttp_headers(session: requests.Session) -> Dict[str, str]:
+    return {k: v for k, v in session.headers.items() if k.lower() not in _AIOHTTP_SKIP_HEADERS}
+
+def _aiohttp_cookies(session: requests.Session) -> Dict[str, str]:
+    return {c.name: c.value for c in session.cookies}
+
+async def open_aiohttp_session(session: requests.Session) -> "aiohttp.ClientSession":
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+        headers=_aiohttp_headers(session),
+        cookies=_aiohttp_cookies(session),
+        timeout=aiohttp.ClientTimeout(total=60),
+    )
+
+def _refresh_aiohttp_session(asession: "aiohttp.ClientSession", session: requests.Session) -> None:
+    asession.headers.update(_aiohttp_headers(session))
+    asession.cookie_jar.update_cookies(_aiohttp_cookies(session))
+
+async def afetch(asession: "aiohttp.ClientSession", url: str) -> Tuple[int, bytes]:
+    async with asession.get(url, headers=_referer_headers(url)) as resp:
+        return resp.status, await resp.read()
+
+async def aitem(
+    asession: "aiohttp.ClientSession",
+    session: requests.Session,
+    sem: asyncio.Semaphore,
+    url: str,
+) -> dict:
+    loop = asyncio.get_running_loop()
+    async with sem:
+        try:
+            status, body = await afetch(asession, url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"[WARN] async request failed {url}: {e}")
+            status, body = 0, b""
+        if status != 200:
+            rec = await loop.run_in_executor(None, scrape_item_with_bs, session, url)
+            _refresh_aiohttp_session(asession, session)
+            return rec
+    return await loop.run_in_executor(None, parse_and_extract, url, body)
+
+async def ascrape_items(
+    asession: "aiohttp.ClientSession",
+    session: requests.Session,
+    links: List[str],
+    concurrency: int,
+) -> List[dict]:
+    sem = asyncio.Semaphore(max(1, concurrency))
+    results = await asyncio.gather(
+        *[aitem(asession, session, sem, u) for u in links], return_exceptions=True
+    )
+    recs = []
+    for url, res in zip(links, results):
+        if isinstance(res, BaseException):
+            if not isinstance(res, Exception):
+                raise res
+            print(f"[WARN] item failed {url}: {res}")
+            res = _empty_record(url)
+        recs.append(res)
+    return recs
+
+UPLOAD_FIELDS = ["protest_id", "file_metadata", "file_content"]
+
+def open_upload_csv(out_csv: str) -> Tuple[TextIO, csv.DictWriter]:
+    try:
+        fh = open(out_csv, "w", newline="", encoding="utf-8", buffering=1 << 16)
+    except PermissionError as pe:
+        print(f"[WARN] CSV locked, writing fallback: {pe}")
+        base, ext = os.path.splitext(out_csv)
+        fh = open(f"{base}_partial{ext}", "w", newline="", encoding="utf-8", buffering=1 << 16)
+    writer = csv.DictWriter(fh, fieldnames=UPLOAD_FIELDS, lineterminator=os.linesep)
+    writer.writeheader()
+    return fh, writer
+
+def upload_row(r: dict) -> dict:
+    base = r["base"]
+    sections_clean = {
+        k: sanitize_for_json(v)
+        for k, v in r["sections"].items()
+        if v and v.strip() and k != "Full Report Text"
+    }
+    meta = {
+        "file_number": base.get("file_number") or "",
+        "title": base.get("title") or "",
+        "date": base.get("date") or "",
+        "pdf_pages": r.get("pdf_pages"),
+        "url": base.get("url") or "",
+        "sections": sections_clean,
+    }
+    meta_json = json.dumps(meta, ensure_ascii=False, separators=(",", ":"))
+    full_txt = sanitize_for_json(r.get("full_text", ""))
+    return {"protest_id": "", "file_metadata": meta_json, "file_content": full_txt}
+
+KNOWN_ORDER_PREF = [
+    "DIGEST", "BACKGROUND", "DISCUSSION", "DECISION", "CONCLUSION", "RECOMMENDATION"
+]
+MASTER_COLS = ["file_number", "title", "date", "pdf_pages", "url"] + KNOWN_ORDER_PREF
+_MASTER_WIDTHS = {"file_number": 14, "title": 45, "date": 14, "pdf_pages": 10, "url": 36}
+_THIN = Side(style="thin")
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="top")
+_WRAP_TOP = "wrap_top"
+_PLAIN_TOP = "plain_top"
+
+def _xlsx_cell(ws, value, style: str) -> WriteOnlyCell:
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+def _xlsx_header(ws, titles: List[str]) -> List[WriteOnlyCell]:
+    row = []
+    for title in titles:
+        cell = WriteOnlyCell(ws, value=title)
+        cell.alignment = _HEADER_ALIGN
+        cell.font = _HEADER_FONT
+        cell.border = _HEADER_BORDER
+        row.append(cell)
+    return row
+
+def init_workbook() -> Tuple[Workbook, Any, Set[str]]:
+    wb = Workbook(write_only=True)
+    wb.add_named_style(NamedStyle(name=_WRAP_TOP, alignment=Alignment(wrap_text=True, vertical="top")))
+    wb.add_named_style(NamedStyle(name=_PLAIN_TOP, alignment=Alignment(vertical="top")))
+    ws = wb.create_sheet("Master")
+    ws.freeze_panes = "A2"
+    for idx, header in enumerate(MASTER_COLS, 1):
+        ws.column_dimensions[get_column_letter(idx)].width = _MASTER_WIDTHS.get(
+            header, 50 if header in KNOWN_ORDER_PREF else 22
         )
-    upload_df = pd.DataFrame(upload_rows, columns=["protest_id", "file_metadata", "file_content"])
-    upload_df.to_csv(out_csv, index=False, encoding="utf-8")
-    print(f"[OK] DB-ready file written → {out_csv}  (rows: {len(upload_rows)})")
-    if out_xlsx:
-        KNOWN_ORDER_PREF = [
-            "DIGEST", "BACKGROUND", "DISCUSSION", "DECISION", "CONCLUSION", "RECOMMENDATION"
-        ]
-        meta_cols = ["file_number", "title", "date", "pdf_pages", "url"]
-        rows = []
-        sheet_map = []
-        for idx, r in enumerate(records, 1):
-            base = r["base"]
-            row = {
-                "file_number": sanitize_for_excel(base.get("file_number", "")),
-                "title": sanitize_for_excel(base.get("title", "")),
-                "date": sanitize_for_excel(base.get("date", "")),
-                "pdf_pages": r.get("pdf_pages", "") or "",
-                "url": base.get("url", ""),
-            }
-            secs = r.get("sections", {})
-            for k in KNOWN_ORDER_PREF:
-                row[k] = sanitize_for_excel(secs.get(k, ""))
-            sheet_name = re.sub(
-                r"[\\/*?:\[\]]",
-                "_",
-                row["file_number"] or row["title"] or f"Item {idx}",
-            )[:31] or f"Item {idx}"
-            col_title = (
-                f"GAO Bid Protest Decision – "
-                f"{row['title'] or row['file_number'] or sheet_name} – Complete Text"
-            )
-            sheet_map.append((sheet_name, col_title, sanitize_for_excel(r.get("full_text", ""))))
-            rows.append(row)
-        master_cols = meta_cols + KNOWN_ORDER_PREF
-        df = pd.DataFrame(rows, columns=master_cols)
-        from openpyxl.styles import Alignment
-        with pd.ExcelWriter(out_xlsx, engine="openpyxl") as xlw:
-            df.to_excel(xlw, sheet_name="Master", index=False)
-            ws = xlw.book["Master"]
-            ws.freeze_panes = "A2"
-            ws.auto_filter.ref = ws.dimensions
-            width_map = {"file_number": 14, "title": 45, "date": 14, "pdf_pages": 10, "url": 36}
-            for col in ws.iter_cols(min_row=1, max_row=1):
-                header = col[0].value
-                ws.column_dimensions[col[0].column_letter].width = width_map.get(
-                    header, 50 if header in KNOWN_ORDER_PREF else 22
-                )
-            for row in ws.iter_rows(min_row=2, max_row=ws.max_row, min_col=1, max_col=ws.max_column):
-                for cell in row:
-                    if ws.cell(1, cell.column).value in KNOWN_ORDER_PREF:
-                        cell.alignment = Alignment(wrap_text=True, vertical="top")
-                    else:
-                        cell.alignment = Alignment(vertical="top")
-            for sheet_name, col_title, text in sheet_map:
-                pd.DataFrame({col_title: [text]}).to_excel(xlw, sheet_name=sheet_name, index=False)
-                wsi = xlw.book[sheet_name]
-                wsi.freeze_panes = "A2"
-                wsi.column_dimensions["A"].width = 120
-                if wsi.max_row >= 2:
-                    wsi["A2"].alignment = Alignment(wrap_text=True, vertical="top")
-        print(f"[OK] Review workbook written → {out_xlsx}  (items: {len(records)})")
-
-def run(search_url: str, out_csv: str, out_xlsx: str, max_pages: int, upto: int):
+    ws.append(_xlsx_header(ws, MASTER_COLS))
+    return wb, ws, {"master"}
+
+def _unique_sheet_name(taken: Set[str], name: str) -> str:
+    candidate, n = name, 1
+    while candidate.lower() in taken:
+        n += 1
+        suffix = f" ({n})"
+        candidate = name[:31 - len(suffix)] + suffix
+    taken.add(candidate.lower())
+    return candidate
+
+def append_record(wb: Workbook, ws, taken: Set[str], r: dict, idx: int) -> None:
+    base = r["base"]
+    row = {
+        "file_number": sanitize_for_excel(base.get("file_number", "")),
+        "title": sanitize_for_excel(base.get("title", "")),
+        "date": sanitize_for_excel(base.get("date", "")),
+        "pdf_pages": r.get("pdf_pages", "") or "",
+        "url": base.get("url", ""),
+    }
+    secs = r.get("sections", {})
+    for k in KNOWN_ORDER_PREF:
+        row[k] = sanitize_for_excel(secs.get(k, ""))
+    ws.append([
+        _xlsx_cell(ws, row[c], _WRAP_TOP if c in KNOWN_ORDER_PREF else _PLAIN_TOP)
+        for c in MASTER_COLS
+    ])
+    sheet_name = (
+        row["file_number"] or row["title"] or f"Item {idx}"
+    ).translate(_SHEET_BAD)[:31] or f"Item {idx}"
+    sheet_name = _unique_sheet_name(taken, sheet_name)
+    col_title = (
+        f"GAO Bid Protest Decision – "
+        f"{row['title'] or row['file_number'] or sheet_name} – Complete Text"
+    )
+    wsi = wb.create_sheet(sheet_name)
+    wsi.freeze_panes = "A2"
+    wsi.column_dimensions["A"].width = 120
+    wsi.append(_xlsx_header(wsi, [col_title]))
+    wsi.append([_xlsx_cell(wsi, sanitize_for_excel(r.get("full_text", "")), _WRAP_TOP)])
+    wsi.close()
+
+def finalize_workbook(wb: Workbook, ws, out_xlsx: str, items: int) -> None:
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(MASTER_COLS))}{items + 1}"
+    try:
+        wb.save(out_xlsx)
+    except PermissionError as pe:
+        print(f"[WARN] Excel locked, writing fallback: {pe}")
+        base, ext = os.path.splitext(out_xlsx)
+        out_xlsx = f"{base}_partial{ext}"
+        wb.save(out_xlsx)
+    print(f"[OK] Review workbook written → {out_xlsx}  (items: {items})")
+
+def run(
+    search_url: str,
+    out_csv: str,
+    out_xlsx: str,
+    max_pages: int,
+    upto: int,
+    workers: int = 8,
+    use_async: bool = False,
+):
+    if use_async and aiohttp is None:
+        print("[WARN] aiohttp is not installed; using threaded fetching.")
+        use_async = False
     session = build_session()
-    records: List[dict] = []
+    seen: Set[int] = set()
     processed = 0
     page_url = search_url
     page_num = 1
+    csv_fh, csv_w = open_upload_csv(out_csv)
+    wb = master = taken = None
+    if out_xlsx:
+        wb, master, taken = init_workbook()
+    loop = asession = ex = None
+    if use_async:
+        loop = asyncio.new_event_loop()
+        asession = loop.run_until_complete(open_aiohttp_session(session))
+    else:
+        ex = ThreadPoolExecutor(max_workers=max(1, workers))
     try:
         while page_url:
-            soup = get_html(session, page_url)
-            if soup is None:
+            tree = get_html(session, page_url)
+            if tree is None:
                 print(f"[WARN] Skipping page (no HTML): {page_url}")
                 break
-            links = collect_result_links_from_page(soup)
-            if not links:
+            links = collect_result_links_from_page(tree, seen)
+            if not links and not collect_result_links_from_page(tree):
                 print("[INFO] No product links found on page.")
                 break
-            for url in links:
-                if upto and processed >= upto:
-                    print(f"[INFO] Reached --upto limit ({upto}). Stopping.")
-                    raise StopIteration
-                rec = scrape_item_with_bs(session, url)
-                records.append(rec)
+            if upto:
+                links = links[:max(0, upto - processed)]
+            if use_async:
+                recs = loop.run_until_complete(ascrape_items(asession, session, links, workers))
+            else:
+                recs = ex.map(lambda u: scrape_item_with_bs(session, u), links)
+            for rec in recs:
                 processed += 1
-                try:
-                    write_outputs(records, out_csv, out_xlsx)
-                except PermissionError as pe:
-                    print(f"[WARN] Excel locked, writing fallback: {pe}")
-                    base, ext = os.path.splitext(out_xlsx)
-                    write_outputs(records, out_csv, f"{base}_partial{ext}")
-                human_sleep()
+                csv_w.writerow(upload_row(rec))
+                if wb is not None:
+                    append_record(wb, master, taken, rec, processed)
+                if processed % WRITE_EVERY == 0:
+                    csv_fh.flush()
+            if upto and processed >= upto:
+                print(f"[INFO] Reached --upto limit ({upto}). Stopping.")
+                break
             page_num += 1
             if max_pages and page_num > max_pages:
                 break
-            nxt = get_next_page(soup)
+            nxt = get_next_page(tree)
             if not nxt:
                 break
             page_url = nxt
             human_sleep(0.6, 1.2)
-    except StopIteration:
-        pass
     except KeyboardInterrupt:
         print("[WARN] Interrupted by user. Saving partial results.")
     except Exception as e:
         print(f"[WARN] Unexpected error: {e}")
     finally:
-        try:
-            write_outputs(records, out_csv, out_xlsx)
-        except PermissionError as pe:
-            print(f"[WARN] Final Excel write locked; writing fallback: {pe}")
-            base, ext = os.path.splitext(out_xlsx)
-            write_outputs(records, out_csv, f"{base}_partial{ext}")
+        if ex is not None:
+            ex.shutdown(wait=False, cancel_futures=True)
+        if loop is not None:
+            loop.run_until_complete(asession.close())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+        csv_fh.close()
+        print(f"[OK] DB-ready file written → {csv_fh.name}  (rows: {processed})")
+        if wb is not None:
+            finalize_workbook(wb, master, out_xlsx, processed)
 
 if __name__ == "__main__":
     ap = argparse.ArgumentParser(
-        description="GAO Bid Protests (BeautifulSoup) → DB-ready CSV/XLSX from View Decision HTML."
+        description="GAO Bid Protests (lxml) → DB-ready CSV/XLSX from View Decision HTML."
     )
     ap.add_argument("--url", default=SEARCH_URL_DEFAULT)
     ap.add_argument("--out-csv", default="goa_protest_file_upload.csv")
     ap.add_argument("--out-xlsx", default="gao_bid_protests.xlsx")
     ap.add_argument("--max-pages", type=int, default=0)
     ap.add_argument("--upto", type=int, default=0, help="Stop after scraping N rows (0 = no limit)")
+    ap.add_argument("--workers", type=int, default=8, help="Concurrent item fetches per results page")
+    ap.add_argument(
+        "--async", dest="use_async", action="store_true",
+        help="Fetch item pages with aiohttp instead of the thread pool",
+    )
     args = ap.parse_args()
     run(
         search_url=args.url,
@@ -409,4 +749,6 @@ if __name__ == "__main__":
         out_xlsx=args.out_xlsx,
         max_pages=args.max_pages,
         upto=args.upto,
+        workers=args.workers,
+        use_async=args.use_async,
     )